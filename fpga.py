@@ -15,18 +15,43 @@ Usage:
 """
 
 import argparse
+import importlib.util
+import os
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 SCRIPTS_DIR = Path(__file__).resolve().parent / "scripts"
 
 
 def run_script(name: str, args: list[str]) -> int:
-    """Run a script from scripts/ with the given arguments."""
+    """Run a script from scripts/ in-process with the given arguments.
+
+    The script's main() is called with sys.argv set as if it had been
+    launched directly, and its exit status is returned.
+    """
     script = SCRIPTS_DIR / name
-    return subprocess.run([sys.executable, str(script)] + args).returncode
+    # Load by path: a `scripts` package installed elsewhere on sys.path
+    # would shadow this directory if it were imported by package name.
+    spec = importlib.util.spec_from_file_location(
+        f"_fpga_{name.removesuffix('.py')}", script
+    )
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    saved_argv = sys.argv
+    sys.argv = [str(script)] + args
+    try:
+        mod.main()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    finally:
+        sys.argv = saved_argv
+    return 0
 
 
 def cmd_sim(args):
@@ -81,24 +106,78 @@ def cmd_new(args):
     return run_script("new_module.py", fwd)
 
 
+def _delete_in_background(path: Path) -> None:
+    """Delete a directory tree from a detached child process."""
+    if os.name == "nt":
+        detach = {
+            "creationflags": subprocess.DETACHED_PROCESS
+            | subprocess.CREATE_NEW_PROCESS_GROUP
+        }
+    else:
+        detach = {"start_new_session": True}
+    subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import shutil, sys; shutil.rmtree(sys.argv[1], ignore_errors=True)",
+            str(path),
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        **detach,
+    )
+
+
+def _remove_tree(path: Path) -> None:
+    """Remove a directory tree without waiting for its files to be deleted.
+
+    The tree is renamed to a hidden sibling, which a detached process then
+    deletes. Falls back to deleting in place if either step fails.
+    """
+    trash = path.with_name(f".{path.name}.trash.{os.getpid()}")
+    try:
+        path.rename(trash)
+    except OSError:
+        shutil.rmtree(path)
+        return
+    try:
+        _delete_in_background(trash)
+    except OSError:
+        shutil.rmtree(trash)
+
+
 def cmd_clean(args):
     root = Path(__file__).resolve().parent
+    # Finish off trees left behind by an interrupted background delete
+    for pattern in (".build.trash.*", ".impl.trash.*"):
+        for stale in root.glob(pattern):
+            if stale.is_dir():
+                _delete_in_background(stale)
     # Clean build/
     build_dir = root / "build"
     if build_dir.exists():
-        shutil.rmtree(build_dir)
+        _remove_tree(build_dir)
         print("Removed build/")
     # Clean impl/
     impl_dir = root / "impl"
     if impl_dir.exists():
-        shutil.rmtree(impl_dir)
+        _remove_tree(impl_dir)
         print("Removed impl/")
     impl_dir.mkdir(exist_ok=True)
     # Clean sim/ directories inside each module (waveforms)
-    for sim_dir in (root / "hdl").rglob("sim"):
-        if sim_dir.is_dir():
-            shutil.rmtree(sim_dir)
-            print(f"Removed {sim_dir.relative_to(root)}/")
+    sim_dirs = []
+    for dirpath, dirnames, _ in os.walk(root / "hdl"):
+        if "sim" in dirnames:
+            sim_dirs.append(Path(dirpath) / "sim")
+            # Don't descend into a tree that is about to be removed
+            dirnames.remove("sim")
+    if sim_dirs:
+        # Independent trees and syscall-bound work, so threads overlap well
+        with ThreadPoolExecutor(max_workers=min(8, len(sim_dirs))) as pool:
+            list(pool.map(shutil.rmtree, sim_dirs))
+    for sim_dir in sim_dirs:
+        print(f"Removed {sim_dir.relative_to(root)}/")
     print("Clean complete.")
     return 0
 
@@ -9,17 +9,15 @@ Usage:
 
 import argparse
 import sys
+from collections.abc import Mapping
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).resolve().parent))
-from common import (
-    find_project_root,
-    load_config,
-    collect_rtl_sources,
-    collect_constraints,
-    require_tool,
-    run,
-)
+
+def _bootstrap() -> None:
+    """Put scripts/ on sys.path so `common` imports when run standalone."""
+    scripts_dir = str(Path(__file__).resolve().parent)
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
 
 
 def tcl_path(p: Path) -> str:
@@ -27,12 +25,14 @@ def tcl_path(p: Path) -> str:
     return str(p.resolve()).replace("\\", "/")
 
 
-def generate_tcl(cfg: dict, root: Path, build_dir: Path, stage: str) -> Path:
+def generate_tcl(cfg: Mapping, root: Path, build_dir: Path, stage: str) -> Path:
     """Generate a Vivado TCL script for the requested build stage.
 
     Stages are cumulative: synth < impl < bit.
     Returns the path to the generated .tcl file.
     """
+    from common import collect_rtl_sources, collect_constraints
+
     project_name = cfg["project"]["name"]
     top = cfg["project"]["top"]
     part = cfg["project"]["part"]
@@ -114,6 +114,9 @@ def generate_tcl(cfg: dict, root: Path, build_dir: Path, stage: str) -> Path:
 
 
 def main():
+    _bootstrap()
+    from common import find_project_root, load_config, require_tool, run
+
     parser = argparse.ArgumentParser(description="Vivado build script")
     parser.add_argument(
         "stage",
@@ -1,12 +1,23 @@
 """common.py -- Shared utilities for FPGA project scripts."""
 
+import functools
+import hashlib
+import heapq
 import os
+import pickle
 import shutil
 import subprocess
 import sys
 import tomllib
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import rtoml as _toml_fast  # optional Rust-backed parser, much faster
+except ImportError:
+    _toml_fast = None
+
 # Well-known MSYS2 directories to search when tools aren't on the Windows PATH.
 _MSYS2_SEARCH_DIRS = [
     Path("C:/msys64/mingw64/bin"),
@@ -14,6 +25,35 @@ _MSYS2_SEARCH_DIRS = [
 ]
 
 _MSYS2_BASH = Path("C:/msys64/usr/bin/bash.exe")
+_MSYS2_PERL = Path("C:/msys64/usr/bin/perl.exe")
+
+# Parsed TOML files keyed by resolved path. A single CLI invocation resolves
+# the module graph several times, so each file is parsed at most once.
+_CONFIG_CACHE: dict[Path, "LazyConfig"] = {}
+_MANIFEST_CACHE: dict[Path, dict] = {}
+
+# resolve_modules() and _build_module_index() results keyed by
+# (root, id(cfg)). The cfg object is kept alongside the result so a
+# recycled id() can never return a stale entry.
+_MODULES_CACHE: dict[tuple[Path, int], tuple[Mapping, list[dict]]] = {}
+_INDEX_CACHE: dict[
+    tuple[Path, int], tuple[Mapping, tuple[dict[str, dict], dict[str, dict]]]
+] = {}
+
+# Bump when the dict returned by collect_sim_target changes shape, so
+# pickles written by an older version are ignored.
+_SIM_TARGET_CACHE_VERSION = 2
+
+# Below this many modules, manifests are parsed serially.
+_PARALLEL_MANIFEST_MIN = 4
+
+
+def _parse_toml(data: bytes) -> dict:
+    """Parse TOML, using rtoml when it is installed and tomllib otherwise."""
+    text = data.decode("utf-8")
+    if _toml_fast is not None:
+        return _toml_fast.loads(text)
+    return tomllib.loads(text)
 
 
 def find_project_root() -> Path:
@@ -28,20 +68,79 @@ def find_project_root() -> Path:
     sys.exit(1)
 
 
-def load_config(root: Path) -> dict:
-    """Read and return the parsed project.toml."""
-    with open(root / "project.toml", "rb") as f:
-        return tomllib.load(f)
+class LazyConfig(Mapping):
+    """Read-only view of a TOML file that is parsed on first access.
+
+    Commands that never look at the config (or exit before they do) skip
+    reading project.toml altogether.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._data: dict | None = None
+
+    def _load(self) -> dict:
+        if self._data is None:
+            with open(self.path, "rb") as f:
+                self._data = _parse_toml(f.read())
+        return self._data
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+
+def load_config(root: Path) -> LazyConfig:
+    """Return project.toml as a mapping, parsed lazily on first access."""
+    path = (root / "project.toml").resolve()
+    cfg = _CONFIG_CACHE.get(path)
+    if cfg is None:
+        cfg = _CONFIG_CACHE[path] = LazyConfig(path)
+    return cfg
 
 
 def load_module_manifest(module_dir: Path) -> dict:
     """Read and return a module's manifest.toml."""
-    manifest_path = module_dir / "manifest.toml"
+    manifest_path = (module_dir / "manifest.toml").resolve()
+    manifest = _MANIFEST_CACHE.get(manifest_path)
+    if manifest is not None:
+        return manifest
     if not manifest_path.is_file():
         print(f"ERROR: manifest.toml not found in {module_dir}", file=sys.stderr)
         sys.exit(1)
     with open(manifest_path, "rb") as f:
-        return tomllib.load(f)
+        manifest = _parse_toml(f.read())
+    _MANIFEST_CACHE[manifest_path] = manifest
+    return manifest
+
+
+@functools.lru_cache(maxsize=None)
+def _dir_entries(d: Path) -> frozenset[str]:
+    """Return the names in a directory, listed once per invocation."""
+    try:
+        with os.scandir(d) as it:
+            return frozenset(entry.name for entry in it)
+    except OSError:
+        return frozenset()
+
+
+def _listed_path_exists(base: Path, p: str) -> bool:
+    """Check that base/p exists using cached directory listings."""
+    parts = Path(p).parts
+    if not parts or Path(p).is_absolute() or ".." in parts:
+        return (base / p).exists()
+    d = base
+    for name in parts:
+        if name != "." and name not in _dir_entries(d):
+            # Listings are case-sensitive; let the filesystem decide on a miss
+            return (base / p).exists()
+        d = d / name
+    return True
 
 
 def resolve_paths(base: Path, paths: list[str]) -> list[Path]:
@@ -49,68 +148,129 @@ def resolve_paths(base: Path, paths: list[str]) -> list[Path]:
     resolved = []
     for p in paths:
         full = base / p
-        if not full.exists():
+        if not _listed_path_exists(base, p):
             print(f"WARNING: listed file does not exist: {full}", file=sys.stderr)
         resolved.append(full)
     return resolved
 
 
-def resolve_modules(root: Path, cfg: dict) -> list[dict]:
+def resolve_modules(root: Path, cfg: Mapping) -> list[dict]:
     """Load all module manifests listed in project.toml, respecting dep order.
 
     Returns a list of dicts, each containing:
         - "dir": Path to the module directory
         - "manifest": parsed manifest.toml dict
+        - "name": module name from the manifest
+        - "rel": module path as listed in project.toml
+
+    These are the same records _build_module_index() produces. The result
+    is cached per (root, cfg) and must not be mutated.
     """
-    module_paths = cfg.get("project", {}).get("modules", [])
-    loaded = []
-    seen = set()
+    key = (root, id(cfg))
+    cached = _MODULES_CACHE.get(key)
+    if cached is not None and cached[0] is cfg:
+        return cached[1]
 
-    def _load(mod_rel: str):
-        if mod_rel in seen:
-            return
-        seen.add(mod_rel)
-
-        mod_dir = root / mod_rel
-        manifest = load_module_manifest(mod_dir)
-
-        # Recursively load dependencies first
-        deps = manifest.get("deps", {}).get("modules", [])
-        for dep_name in deps:
-            # Find the dep in the project module list by matching the module name
-            dep_path = _find_module_path(root, cfg, dep_name)
-            if dep_path:
-                _load(dep_path)
-            else:
-                print(
-                    f"ERROR: module '{mod_rel}' depends on '{dep_name}', "
-                    f"which is not listed in project.toml modules",
-                    file=sys.stderr,
-                )
-                sys.exit(1)
-
-        loaded.append({"dir": mod_dir, "manifest": manifest})
-
-    for mod_rel in module_paths:
-        _load(mod_rel)
+    by_rel, by_name = _build_module_index(root, cfg)
+    loaded = [by_rel[rel] for rel in _topo_sort(by_rel, by_name)]
 
+    _MODULES_CACHE[key] = (cfg, loaded)
     return loaded
 
 
-def _find_module_path(root: Path, cfg: dict, module_name: str) -> str | None:
-    """Find a module's relative path in project.toml by its manifest name."""
-    for mod_rel in cfg.get("project", {}).get("modules", []):
-        mod_dir = root / mod_rel
-        manifest_path = mod_dir / "manifest.toml"
-        if manifest_path.is_file():
-            with open(manifest_path, "rb") as f:
-                m = tomllib.load(f)
-            if m.get("module", {}).get("name") == module_name:
-                return mod_rel
-    return None
+def _dep_rels(mod: dict, by_name: dict[str, dict]) -> list[str]:
+    """Return the listed paths of a module's direct deps. Exits on unknown deps."""
+    rels = []
+    for dep_name in mod["manifest"].get("deps", {}).get("modules", []):
+        dep = by_name.get(dep_name)
+        if dep is None:
+            print(
+                f"ERROR: module '{mod['rel']}' depends on '{dep_name}', "
+                f"which is not listed in project.toml modules",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        rels.append(dep["rel"])
+    return rels
+
+
+def _topo_sort(by_rel: dict[str, dict], by_name: dict[str, dict]) -> list[str]:
+    """Return module paths ordered so every module follows its dependencies.
+
+    Uses Kahn's algorithm, always taking the ready module listed earliest
+    in project.toml, so a list that is already dependencies-first comes
+    out unchanged. Exits on unknown deps or cycles.
+    """
+    position = {rel: i for i, rel in enumerate(by_rel)}
+    adj: dict[str, list[str]] = {rel: [] for rel in by_rel}
+    indeg: dict[str, int] = {}
+    for rel, mod in by_rel.items():
+        deps = dict.fromkeys(_dep_rels(mod, by_name))
+        for dep_rel in deps:
+            adj[dep_rel].append(rel)
+        indeg[rel] = len(deps)
+
+    ready = [(position[rel], rel) for rel, n in indeg.items() if n == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, rel = heapq.heappop(ready)
+        order.append(rel)
+        for succ in adj[rel]:
+            indeg[succ] -= 1
+            if indeg[succ] == 0:
+                heapq.heappush(ready, (position[succ], succ))
+
+    if len(order) < len(by_rel):
+        cycle = ", ".join(rel for rel, n in indeg.items() if n > 0)
+        print(f"ERROR: dependency cycle between modules: {cycle}", file=sys.stderr)
+        sys.exit(1)
+
+    return order
+
 
+def _build_module_index(
+    root: Path, cfg: Mapping
+) -> tuple[dict[str, dict], dict[str, dict]]:
+    """Index the listed modules, parsing every manifest once.
 
-def collect_rtl_sources(root: Path, cfg: dict) -> tuple[list[Path], list[Path]]:
+    Returns (by_rel, by_name). by_rel holds every module listed in
+    project.toml, in listed order, keyed by its listed path. by_name maps
+    a manifest name to the first listed module with that name and is only
+    used to resolve deps. Each record contains:
+        - "dir": Path to the module directory
+        - "manifest": parsed manifest.toml dict
+        - "name": module name from the manifest
+        - "rel": module path as listed in project.toml
+    """
+    key = (root, id(cfg))
+    cached = _INDEX_CACHE.get(key)
+    if cached is not None and cached[0] is cfg:
+        return cached[1]
+
+    module_paths = list(dict.fromkeys(cfg.get("project", {}).get("modules", [])))
+    mod_dirs = [root / mod_rel for mod_rel in module_paths]
+    if len(mod_dirs) < _PARALLEL_MANIFEST_MIN:
+        manifests = [load_module_manifest(d) for d in mod_dirs]
+    else:
+        # Manifest reads are I/O-bound; overlap them on a small thread pool
+        workers = min(16, len(mod_dirs))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            manifests = list(pool.map(load_module_manifest, mod_dirs))
+
+    by_rel = {}
+    by_name = {}
+    for mod_rel, mod_dir, manifest in zip(module_paths, mod_dirs, manifests):
+        name = manifest.get("module", {}).get("name", "")
+        mod = {"dir": mod_dir, "manifest": manifest, "name": name, "rel": mod_rel}
+        by_rel[mod_rel] = mod
+        by_name.setdefault(name, mod)
+
+    _INDEX_CACHE[key] = (cfg, (by_rel, by_name))
+    return by_rel, by_name
+
+
+def collect_rtl_sources(root: Path, cfg: Mapping) -> tuple[list[Path], list[Path]]:
     """Collect all RTL sources and include dirs across all modules.
 
     Returns (sources, include_dirs) with paths in dependency order.
@@ -128,7 +288,7 @@ def collect_rtl_sources(root: Path, cfg: dict) -> tuple[list[Path], list[Path]]:
     return sources, include_dirs
 
 
-def collect_constraints(root: Path, cfg: dict) -> list[Path]:
+def collect_constraints(root: Path, cfg: Mapping) -> list[Path]:
     """Collect all constraint files across all modules."""
     modules = resolve_modules(root, cfg)
     constraints = []
@@ -142,24 +302,97 @@ def collect_constraints(root: Path, cfg: dict) -> list[Path]:
 
 
 def collect_sim_target(
-    root: Path, cfg: dict, target: str, module_name: str | None = None
+    root: Path, cfg: Mapping, target: str, module_name: str | None = None
 ) -> dict | None:
     """Find a simulation target across modules.
 
     If module_name is given, only search that module.
     Returns a dict with keys: top, sources, include_dirs, verilator_flags, mod_dir.
+    sources and include_dirs are absolute path strings.
     Returns None if not found.
+
+    Resolved targets are cached under build/ keyed by the mtimes and sizes
+    of project.toml and every module manifest, so an unchanged project skips
+    manifest parsing entirely.
     """
+    cache_file = _sim_target_cache_file(root, cfg, target, module_name)
+    if cache_file is not None and cache_file.is_file():
+        try:
+            with open(cache_file, "rb") as f:
+                sim = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+        else:
+            # Files can vanish without any manifest changing; warn as a
+            # fresh resolution would.
+            for p in sim["sources"] + sim["include_dirs"]:
+                full = Path(p)
+                if not _listed_path_exists(full.parent, full.name):
+                    print(
+                        f"WARNING: listed file does not exist: {full}",
+                        file=sys.stderr,
+                    )
+            return sim
+
+    sim = _find_sim_target(root, cfg, target, module_name)
+
+    if sim is not None and cache_file is not None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Drop older entries for exactly this <target>_<module>
+            entry = cache_file.name.rsplit("_", 1)[0]
+            for stale in cache_file.parent.iterdir():
+                if stale.suffix == ".pkl" and stale.name.rsplit("_", 1)[0] == entry:
+                    stale.unlink(missing_ok=True)
+            # Write to a temp file and swap it in, so an interrupted write or
+            # a concurrent run never sees a truncated pickle
+            tmp = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp, "wb") as f:
+                    pickle.dump(sim, f)
+                os.replace(tmp, cache_file)
+            finally:
+                tmp.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    return sim
+
+
+def _sim_target_cache_file(
+    root: Path, cfg: Mapping, target: str, module_name: str | None
+) -> Path | None:
+    """Return the on-disk cache path for a sim target, or None if unstattable."""
+    files = [root / "project.toml"] + [
+        root / mod_rel / "manifest.toml"
+        for mod_rel in cfg.get("project", {}).get("modules", [])
+    ]
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"v{_SIM_TARGET_CACHE_VERSION}\0{target}\0{module_name}".encode())
+    try:
+        for p in files:
+            st = p.stat()
+            # Size too, since coarse mtimes (e.g. FAT's 2 s) can miss an edit
+            h.update(f"\0{p}:{st.st_mtime_ns}:{st.st_size}".encode())
+    except OSError:
+        return None
+    name = f"{target}_{module_name or 'all'}_{h.hexdigest()}.pkl"
+    return root / "build" / ".sim_target_cache" / name
+
+
+def _find_sim_target(
+    root: Path, cfg: Mapping, target: str, module_name: str | None
+) -> dict | None:
+    """Resolve a simulation target from the module manifests."""
     modules = resolve_modules(root, cfg)
+    if module_name:
+        modules = [m for m in modules if m["name"] == module_name]
     global_flags = cfg.get("sim", {}).get("verilator_flags", [])
 
     for mod in modules:
         mod_dir = mod["dir"]
         manifest = mod["manifest"]
-        name = manifest.get("module", {}).get("name", "")
-
-        if module_name and name != module_name:
-            continue
+        name = mod["name"]
 
         sim_targets = manifest.get("sim", {})
         if target in sim_targets:
@@ -174,9 +407,10 @@ def collect_sim_target(
             # Sim-specific include dirs
             sim_inc_dirs = resolve_paths(mod_dir, tcfg.get("include_dirs", []))
 
-            # Merge: RTL sources first, then testbench sources
-            all_sources = rtl_sources + sim_sources
-            all_inc_dirs = rtl_inc_dirs + sim_inc_dirs
+            # Merge: RTL sources first, then testbench sources. Stringified
+            # once here since they only ever end up on a command line.
+            all_sources = [str(p) for p in rtl_sources + sim_sources]
+            all_inc_dirs = [str(p) for p in rtl_inc_dirs + sim_inc_dirs]
 
             # Merge verilator flags: global + per-target
             flags = list(global_flags) + tcfg.get("verilator_flags", [])
@@ -193,7 +427,7 @@ def collect_sim_target(
     return None
 
 
-def list_sim_targets(root: Path, cfg: dict) -> list[str]:
+def list_sim_targets(root: Path, cfg: Mapping) -> list[str]:
     """List all available simulation targets as 'module.target' strings."""
     modules = resolve_modules(root, cfg)
     targets = []
@@ -206,56 +440,57 @@ def list_sim_targets(root: Path, cfg: dict) -> list[str]:
 
 
 def _collect_rtl_for_module(
-    root: Path, cfg: dict, mod: dict
+    root: Path, cfg: Mapping, mod: dict
 ) -> tuple[list[Path], list[Path]]:
     """Collect RTL sources for a module and all its dependencies."""
-    all_modules = resolve_modules(root, cfg)
-    manifest = mod["manifest"]
-    mod_name = manifest.get("module", {}).get("name", "")
+    by_rel, _ = _build_module_index(root, cfg)
 
-    # Find this module and all its transitive deps
-    dep_names = _transitive_deps(root, cfg, mod_name)
-    dep_names.append(mod_name)
+    # This module's transitive deps in dependency order, then the module itself
+    dep_rels = _transitive_deps(root, cfg, mod["rel"])
 
     sources = []
     include_dirs = []
-    for m in all_modules:
-        mname = m["manifest"].get("module", {}).get("name", "")
-        if mname in dep_names:
-            rtl = m["manifest"].get("rtl", {})
-            sources.extend(resolve_paths(m["dir"], rtl.get("sources", [])))
-            include_dirs.extend(resolve_paths(m["dir"], rtl.get("include_dirs", [])))
+    for m in [by_rel[rel] for rel in dep_rels] + [mod]:
+        rtl = m["manifest"].get("rtl", {})
+        sources.extend(resolve_paths(m["dir"], rtl.get("sources", [])))
+        include_dirs.extend(resolve_paths(m["dir"], rtl.get("include_dirs", [])))
 
     return sources, include_dirs
 
 
-def _transitive_deps(root: Path, cfg: dict, module_name: str) -> list[str]:
-    """Return a flat list of all transitive dependency names for a module."""
-    result = []
-    visited = set()
+def _transitive_deps(root: Path, cfg: Mapping, mod_rel: str) -> list[str]:
+    """Return the listed paths of all transitive deps of a module, deps first.
 
-    def _walk(name: str):
-        if name in visited:
-            return
-        visited.add(name)
-        mod_rel = _find_module_path(root, cfg, name)
-        if not mod_rel:
-            return
-        mod_dir = root / mod_rel
-        manifest = load_module_manifest(mod_dir)
-        for dep in manifest.get("deps", {}).get("modules", []):
-            _walk(dep)
-            if dep not in result:
-                result.append(dep)
+    Iterative post-order DFS from the module. resolve_modules() has already
+    rejected unknown deps and cycles, so a single seen set is enough.
+    """
+    resolve_modules(root, cfg)
+    by_rel, by_name = _build_module_index(root, cfg)
+    order = []
+    seen = set()
+    stack = [(mod_rel, False)]
+    while stack:
+        rel, processed = stack.pop()
+        if processed:
+            order.append(rel)
+            continue
+        if rel in seen:
+            continue
+        seen.add(rel)
+        stack.append((rel, True))
+        for dep_rel in reversed(_dep_rels(by_rel[rel], by_name)):
+            if dep_rel not in seen:
+                stack.append((dep_rel, False))
 
-    _walk(module_name)
-    return result
+    # The module itself finishes last
+    return order[:-1]
 
 
 # ---------------------------------------------------------------------------
 # Tool detection and subprocess execution (MSYS2-aware)
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=None)
 def require_tool(name: str, hint: str = "") -> Path:
     """Find a tool on PATH or in well-known MSYS2 locations."""
     exe = shutil.which(name)
@@ -277,18 +512,47 @@ def require_tool(name: str, hint: str = "") -> Path:
     sys.exit(1)
 
 
+@functools.lru_cache(maxsize=4096)
 def _to_msys2_path(p: str) -> str:
     """Convert a Windows path to MSYS2 Unix-style path.
 
     C:\\Users\\foo  ->  /c/Users/foo
     C:/Users/foo   ->  /c/Users/foo
     """
-    s = str(p).replace("\\", "/")
+    s = p.replace("\\", "/")
     if len(s) >= 2 and s[1] == ":":
         s = "/" + s[0].lower() + s[2:]
     return s
 
 
+@functools.lru_cache(maxsize=None)
+def _tool_env() -> dict[str, str]:
+    """Return os.environ with the MSYS2 tool dirs prepended to PATH.
+
+    Built once per invocation; callers must not mutate the result.
+    """
+    env = os.environ.copy()
+    for d in _MSYS2_SEARCH_DIRS:
+        if d.is_dir():
+            env["PATH"] = str(d) + os.pathsep + env.get("PATH", "")
+    return env
+
+
+@functools.lru_cache(maxsize=None)
+def _msys2_env() -> dict[str, str]:
+    """Return os.environ as a MINGW64 login shell would set it up.
+
+    /mingw64/bin goes ahead of /usr/bin, which is needed for g++, make,
+    python3, etc. Built once per invocation; callers must not mutate it.
+    """
+    env = os.environ.copy()
+    env["MSYSTEM"] = "MINGW64"
+    dirs = [str(d) for d in _MSYS2_SEARCH_DIRS if d.is_dir()]
+    env["PATH"] = os.pathsep.join(dirs + [env.get("PATH", "")])
+    return env
+
+
+@functools.lru_cache(maxsize=None)
 def _needs_msys2(exe: Path) -> bool:
     """Return True if the executable is an extensionless script requiring MSYS2."""
     return (
@@ -299,18 +563,35 @@ def _needs_msys2(exe: Path) -> bool:
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _is_perl_script(exe: Path) -> bool:
+    """Return True if the file starts with a shebang that names perl."""
+    try:
+        with open(exe, "rb") as f:
+            first_line = f.readline(256)
+    except OSError:
+        return False
+    return first_line.startswith(b"#!") and b"perl" in first_line
+
+
 def run(cmd: list[str], *, cwd: Path | None = None, env=None) -> None:
     """Run a subprocess, streaming output. Exit on failure.
 
     On Windows, if the executable is an extensionless script (e.g. a Perl
-    wrapper like verilator), it is invoked through the MSYS2 bash shell
-    with all paths converted to Unix-style so MSYS2 tools can resolve them.
+    wrapper like verilator), it is handed to MSYS2 perl directly when
+    possible. Other scripts are invoked through the MSYS2 bash shell with
+    all paths converted to Unix-style so MSYS2 tools can resolve them.
     """
     exe = Path(cmd[0])
 
-    if _needs_msys2(exe):
+    if _needs_msys2(exe) and _MSYS2_PERL.is_file() and _is_perl_script(exe):
+        # Skips the bash login shell, whose profile sourcing dominates short
+        # runs; _msys2_env() sets up PATH the way `bash -l` would.
+        print(f">> {' '.join(cmd)}")
+        result = subprocess.run([str(_MSYS2_PERL)] + cmd, cwd=cwd, env=_msys2_env())
+    elif _needs_msys2(exe):
         unix_cmd = [_to_msys2_path(c) for c in cmd]
-        unix_cwd = _to_msys2_path(cwd) if cwd else None
+        unix_cwd = _to_msys2_path(str(cwd)) if cwd else None
 
         shell_cmd = " ".join(f"'{c}'" for c in unix_cmd)
         if unix_cwd:
@@ -326,11 +607,8 @@ def run(cmd: list[str], *, cwd: Path | None = None, env=None) -> None:
         result = subprocess.run(final_cmd, env=msys_env)
     else:
         if env is None:
-            env = os.environ.copy()
-            for d in _MSYS2_SEARCH_DIRS:
-                if d.is_dir():
-                    env["PATH"] = str(d) + os.pathsep + env.get("PATH", "")
-        print(f">> {' '.join(str(c) for c in cmd)}")
+            env = _tool_env()
+        print(f">> {' '.join(cmd)}")
         result = subprocess.run(cmd, cwd=cwd, env=env)
 
     if result.returncode != 0:
@@ -8,15 +8,108 @@ Usage:
 """
 
 import argparse
+import re
 import sys
 import tomllib
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).resolve().parent))
-from common import find_project_root
+
+def _bootstrap() -> None:
+    """Put scripts/ on sys.path so `common` imports when run standalone."""
+    scripts_dir = str(Path(__file__).resolve().parent)
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+
+
+# Start of the `modules = [` array in project.toml.
+_MODULES_ARRAY_START = re.compile(r"^modules\s*=\s*\[", re.MULTILINE)
+
+
+def _scan_array(text: str, start: int) -> tuple[int, list[tuple[int, int]]] | None:
+    """Scan a TOML string array whose body begins at start.
+
+    Skips over strings and comments, so a `]` inside either does not end the
+    array. Returns the index of the closing bracket and the (start, end)
+    span of each string entry, or None if the array is never closed.
+    """
+    entries = []
+    i = start
+    while i < len(text):
+        c = text[i]
+        if c == "]":
+            return i, entries
+        if c == "#":
+            nl = text.find("\n", i)
+            i = len(text) if nl == -1 else nl
+            continue
+        if c in "\"'":
+            j = i + 1
+            while j < len(text) and text[j] != c:
+                j += 2 if c == '"' and text[j] == "\\" else 1
+            if j >= len(text):
+                return None
+            entries.append((i, j + 1))
+            i = j
+        i += 1
+    return None
+
+
+def _append_module(text: str, mod_rel: str) -> str | None:
+    """Return project.toml text with mod_rel appended to the modules array.
+
+    The new entry always goes last, since modules are listed in dependency
+    order. Returns None if the array cannot be located.
+    """
+    m = _MODULES_ARRAY_START.search(text)
+    if m is None:
+        return None
+    scanned = _scan_array(text, m.end())
+    if scanned is None:
+        return None
+    close, entries = scanned
+
+    if not entries:
+        # Keep whatever the empty array holds (e.g. commented-out entries)
+        body = text[m.end() : close]
+        if "\n" not in body:
+            return text[: m.end()] + f'\n    "{mod_rel}",\n' + text[close:]
+        line_start = text.rfind("\n", 0, close) + 1
+        if text[line_start:close].strip():
+            # Something other than indentation precedes the bracket
+            return text[:close] + f'\n    "{mod_rel}",\n' + text[close:]
+        return text[:line_start] + f'    "{mod_rel}",\n' + text[line_start:]
+
+    # Make sure the current last entry has a trailing comma
+    last_end = entries[-1][1]
+    after = text[last_end:close]
+    if after.lstrip(" \t").startswith(","):
+        comma_end = last_end + after.index(",") + 1
+    else:
+        text = text[:last_end] + "," + text[last_end:]
+        close += 1
+        comma_end = last_end + 1
+
+    if "\n" not in text[m.end() : close]:
+        # Single-line array
+        return text[:comma_end] + f' "{mod_rel}"' + text[comma_end:]
+
+    # Multi-line array: new line after the last entry's line, matching its
+    # indentation and keeping any comment on that line where it is
+    line_start = text.rfind("\n", 0, entries[-1][0]) + 1
+    indent = text[line_start : entries[-1][0]]
+    if indent.strip():
+        indent = "    "
+    line_end = text.find("\n", comma_end, close)
+    if line_end == -1:
+        # Closing bracket shares the last entry's line
+        return text[:comma_end] + f'\n{indent}"{mod_rel}"' + text[comma_end:]
+    return text[:line_end] + f'\n{indent}"{mod_rel}",' + text[line_end:]
 
 
 def main():
+    _bootstrap()
+    from common import find_project_root
+
     parser = argparse.ArgumentParser(description="Create a new HDL module")
     parser.add_argument("name", help="Module name (e.g. uart, spi, blinker)")
     parser.add_argument(
@@ -125,26 +218,10 @@ verilator_flags = []
     modules = cfg.get("project", {}).get("modules", [])
     if mod_rel not in modules:
         text = proj_toml.read_text(encoding="utf-8")
-        # Insert new module before the closing bracket of the modules array
-        old = f'    "hdl/top",\n]'
-        # Find the last entry to append after it
-        lines = text.splitlines(keepends=True)
-        new_lines = []
-        inserted = False
-        for line in lines:
-            new_lines.append(line)
-            if not inserted and line.strip().startswith('"hdl/') and line.rstrip().endswith(","):
-                # Check if next non-blank line is ']' — if so, insert before it
-                pass
-            if not inserted and line.strip() == "]" and any(
-                '"hdl/' in prev for prev in new_lines[-5:]
-            ):
-                # Insert before this closing bracket
-                new_lines.insert(-1, f'    "{mod_rel}",\n')
-                inserted = True
-
-        if inserted:
-            proj_toml.write_text("".join(new_lines), encoding="utf-8")
+        new_text = _append_module(text, mod_rel)
+
+        if new_text is not None:
+            proj_toml.write_text(new_text, encoding="utf-8")
             print(f"Added '{mod_rel}' to project.toml modules")
         else:
             print(
@@ -8,23 +8,80 @@ Usage:
 """
 
 import argparse
+import hashlib
 import os
 import shutil
+import stat
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).resolve().parent))
-from common import (
-    find_project_root,
-    load_config,
-    collect_sim_target,
-    list_sim_targets,
-    require_tool,
-    run,
-)
+
+def _bootstrap() -> None:
+    """Put scripts/ on sys.path so `common` imports when run standalone."""
+    scripts_dir = str(Path(__file__).resolve().parent)
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+
+
+def _inputs_digest(
+    cmd: list[str],
+    sources: list[str],
+    inc_dirs: list[str],
+    extra_flags: list[str],
+    cwd: Path,
+) -> str:
+    """Hash a Verilator command line and the size/mtime of its inputs.
+
+    Covered: the Verilator executable itself (cmd[0]), any verilator_flags
+    token naming an existing file relative to cwd (e.g. a C++ harness or an
+    -f file), and every file directly inside an include dir or a source's
+    directory, so edits to `include`d headers also change the digest.
+
+    Not covered: files referenced from inside -f files, anything under
+    VERILATOR_ROOT other than the executable, and the C++ toolchain. Use
+    --clean after changing those.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for arg in cmd:
+        h.update(arg.encode() + b"\0")
+
+    for path in [cmd[0]] + [os.path.join(cwd, f) for f in extra_flags]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            h.update(path.encode() + b"\0")
+            h.update(st.st_mtime_ns.to_bytes(8, "little"))
+            h.update(st.st_size.to_bytes(8, "little"))
+
+    for d in dict.fromkeys(inc_dirs + [os.path.dirname(s) for s in sources]):
+        h.update(d.encode() + b"\0")
+        try:
+            with os.scandir(d) as it:
+                files = sorted((e for e in it if e.is_file()), key=lambda e: e.name)
+                for entry in files:
+                    st = entry.stat()
+                    h.update(entry.name.encode() + b"\0")
+                    h.update(st.st_mtime_ns.to_bytes(8, "little"))
+                    h.update(st.st_size.to_bytes(8, "little"))
+        except OSError:
+            pass
+
+    return h.hexdigest()
 
 
 def main():
+    _bootstrap()
+    from common import (
+        find_project_root,
+        load_config,
+        collect_sim_target,
+        list_sim_targets,
+        require_tool,
+        run,
+    )
+
     parser = argparse.ArgumentParser(description="Run Verilator simulation")
     parser.add_argument(
         "target",
@@ -111,7 +168,8 @@ def main():
     if args.lint_only:
         cmd += ["--lint-only"]
     else:
-        cmd += ["--binary"]
+        # --build-jobs also sets -j for the make step Verilator runs itself
+        cmd += ["--binary", "--build-jobs", str(os.cpu_count() or 4)]
 
     cmd += ["-sv", "--top-module", top]
     cmd += ["-Mdir", str(build_dir)]
@@ -125,19 +183,29 @@ def main():
         cmd += [f"+incdir+{inc}"]
 
     cmd += extra_flags
-    cmd += [str(s) for s in sources]
-
-    run(cmd, cwd=build_dir)
+    cmd += sources
 
     if args.lint_only:
+        run(cmd, cwd=build_dir)
         print("Lint passed.")
         return
 
-    # Run the compiled binary from the sim dir so waveforms land there
     binary = build_dir / f"V{top}"
     if os.name == "nt":
         binary = binary.with_suffix(".exe")
 
+    # Skip Verilator entirely when nothing it reads has changed since the
+    # binary was last built.
+    stamp = build_dir / ".sim_inputs.hash"
+    digest = _inputs_digest(cmd, sources, inc_dirs, extra_flags, build_dir)
+    if binary.exists() and stamp.is_file() and stamp.read_text() == digest:
+        print(f"Inputs unchanged, reusing {binary.name}")
+    else:
+        stamp.unlink(missing_ok=True)
+        run(cmd, cwd=build_dir)
+        stamp.write_text(digest)
+
+    # Run the compiled binary from the sim dir so waveforms land there
     if not binary.exists():
         print(f"ERROR: expected binary not found: {binary}", file=sys.stderr)
         sys.exit(1)